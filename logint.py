@@ -5,106 +5,403 @@ import re
 import os.path
 import sys
 import datetime
+import heapq
 import dateutil.parser
 import dateutil.tz
 import argparse
+import atexit
+import io
+import mmap
+import threading
+try:
+	import queue
+except ImportError:
+	import Queue as queue
+try:
+	import liburing
+except ImportError:
+	liburing = None
+try:
+	import re2
+except ImportError:
+	re2 = None
 
 DEFAULT_REGEX = r'^\[?([^]]+)(]|: )'
 
 TS_WITH_ZONE = datetime.datetime.now(tz=dateutil.tz.tzlocal())
 YEAR_SPLIT = (TS_WITH_ZONE.year % 100) + 10
 
+READ_CHUNK_SIZE = io.DEFAULT_BUFFER_SIZE * 16
+OUTPUT_BUFFER_SIZE = 1 << 20
+STDOUT = io.open(sys.stdout.fileno(), 'wb', buffering=OUTPUT_BUFFER_SIZE, closefd=False)
+atexit.register(STDOUT.flush)
+
+def text(value):
+	return value.decode('utf-8', 'replace') if isinstance(value, bytes) else value
+
+class LogIntError(Exception):
+	def __str__(self):
+		return self.args[0].format(*[text(arg) for arg in self.args[1:]])
+
+class IntTable(dict):
+	def __missing__(self, key):
+		return int(key)
+
+_INT2 = IntTable(('{:02}'.format(i).encode('ascii'), i) for i in range(100))
+_INT2.update((str(i).encode('ascii'), i) for i in range(10))
+_INT4 = IntTable(('{:04}'.format(i).encode('ascii'), i) for i in range(1900, 2100))
+
+def expand_year(year):
+	if year < 100:
+		return year + (2000 if year <= YEAR_SPLIT else 1900)
+	return year
+
+class YearTable(IntTable):
+	def __missing__(self, key):
+		return expand_year(int(key))
+
+_YEARS = YearTable(_INT4)
+_YEARS.update((key, expand_year(year)) for key, year in _INT2.items())
+
 VALID_COMPONENTS = {'s', 'y', 'm', 'b', 'd', 'H', 'M', 'S', 'f'}
 
-MONTH_MAP = {m.lower(): i for i, m in enumerate(['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'], start=1)}
-_month_from_str_cache = {}
+MONTH_PREFIXES = {}
+for month, name in enumerate(['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'], start=1):
+	for end in range(1, len(name) + 1):
+		MONTH_PREFIXES.setdefault(name[:end].lower().encode('ascii'), month)
 def month_from_str(monthval):
-	global _month_from_str_cache
 	if not monthval:
 		raise ValueError()
-	if monthval[:9] in _month_from_str_cache:
-		return _month_from_str_cache[monthval[:9]]
-	monthstr = monthval.lower()
 	try:
-		month = next(MONTH_MAP[m] for m in MONTH_MAP if m.startswith(monthstr))
-	except StopIteration:
+		return MONTH_PREFIXES[monthval.lower()]
+	except KeyError:
 		raise ValueError()
-	_month_from_str_cache[monthval[:9]] = month
-	return month
 
-def datetime_from_match(match, filename):
-	if match.re.groupindex:
-		vals = match.groupdict()
-		if 's' in vals:
-			try:
-				return datetime.datetime.fromtimestamp(float(vals['s']), tz=dateutil.tz.tzutc())
-			except ValueError:
-				sys.exit("ERROR: got invalid unix timestamp '{}' with regex '{}' in file '{}' with line: {}".format(vals['s'], match.re.pattern, filename, match.string))
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=dateutil.tz.tzutc())
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+def datetime_to_ns(ts):
+	delta = ts - EPOCH
+	return (delta.days * 86400 + delta.seconds) * 1000000000 + delta.microseconds * 1000
+
+_local_offset_cache = {}
+def local_offset(ordinal, hour):
+	key = ordinal * 24 + hour
+	if key not in _local_offset_cache:
+		date = datetime.date.fromordinal(ordinal)
+		offset = datetime.datetime(date.year, date.month, date.day, hour, tzinfo=TS_WITH_ZONE.tzinfo).utcoffset()
+		_local_offset_cache[key] = offset.days * 86400 + offset.seconds
+	return _local_offset_cache[key]
+
+def epoch_ns(year, month, day, hour, minute, second, microsecond, offset=None):
+	ordinal = datetime.date(year, month, day).toordinal()
+	if not (0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60 and 0 <= microsecond < 1000000):
+		datetime.time(hour, minute, second, microsecond)
+	if offset is None:
+		offset = local_offset(ordinal, hour)
+	return ((ordinal - EPOCH_ORDINAL) * 86400 + hour * 3600 + minute * 60 + second - offset) * 1000000000 + microsecond * 1000
+
+_fast_offset_cache = {}
+def fast_offset(zone):
+	if not zone:
+		return None
+	if zone not in _fast_offset_cache:
+		if zone == b'Z':
+			_fast_offset_cache[zone] = 0
 		else:
-			if 'm' in vals:
-				try:
-					month = int(vals['m'])
-				except ValueError:
-					sys.exit("ERROR: got invalid integer month '{}' with regex '{}' in file '{}' with line: {}".format(vals['m'], match.re.pattern, filename, match.string))
-			else:
-				try:
-					month = month_from_str(vals['b'])
-				except ValueError:
-					sys.exit("ERROR: got invalid month string '{}' with regex '{}' in file '{}' with line: {}".format(vals['b'], match.re.pattern, filename, match.string))
-			if 'y' in vals:
+			offset = int(zone[1:3]) * 3600 + int(zone[-2:]) * 60
+			_fast_offset_cache[zone] = -offset if zone[:1] == b'-' else offset
+	return _fast_offset_cache[zone]
+
+FAST_DATE_FORMATS = [
+	(re.compile(br'([0-9]{4})([-/])([0-9]{2})\2([0-9]{2})[T ]([0-9]{2}):([0-9]{2}):([0-9]{2})(?:[.,]([0-9]{1,6}))? ?(Z|[-+][0-9]{2}:?[0-9]{2})?$'),
+		lambda m: epoch_ns(_INT4[m.group(1)], _INT2[m.group(3)], _INT2[m.group(4)], _INT2[m.group(5)], _INT2[m.group(6)], _INT2[m.group(7)], int(m.group(8).ljust(6, b'0')) if m.group(8) else 0, fast_offset(m.group(9)))),
+	(re.compile(br'([A-Za-z]{3}) +([0-9]{1,2}) ([0-9]{2}):([0-9]{2}):([0-9]{2})$'),
+		lambda m: epoch_ns(TS_WITH_ZONE.year, month_from_str(m.group(1)), _INT2[m.group(2)], _INT2[m.group(3)], _INT2[m.group(4)], _INT2[m.group(5)], 0)),
+	(re.compile(br'(?:[A-Za-z]{3} )?([A-Za-z]{3}) +([0-9]{1,2}) ([0-9]{2}):([0-9]{2}):([0-9]{2}) ([0-9]{4})$'),
+		lambda m: epoch_ns(_INT4[m.group(6)], month_from_str(m.group(1)), _INT2[m.group(2)], _INT2[m.group(3)], _INT2[m.group(4)], _INT2[m.group(5)], 0)),
+	(re.compile(br'([A-Za-z]{3}) +([0-9]{1,2}) ([0-9]{4}) ([0-9]{2}):([0-9]{2}):([0-9]{2})$'),
+		lambda m: epoch_ns(_INT4[m.group(3)], month_from_str(m.group(1)), _INT2[m.group(2)], _INT2[m.group(4)], _INT2[m.group(5)], _INT2[m.group(6)], 0)),
+]
+class FastDateParser(object):
+	def __init__(self):
+		self._regex = None
+		self._build = None
+
+	def parse(self, datestr):
+		if self._regex:
+			match = self._regex.match(datestr)
+			if match:
 				try:
-					year = int(vals['y'])
+					return self._build(match)
 				except ValueError:
-					sys.exit("ERROR: got invalid integer year '{}' with regex '{}' in file '{}' with line: {}".format(vals['y'], match.re.pattern, filename, match.string))
-				if year < 100:
-					if year <= YEAR_SPLIT:
-						year = year + 2000
-					else:
-						year = year + 1900
-			else:
-				year = TS_WITH_ZONE.year
+					pass
+		ts = dateutil.parser.parse(text(datestr), default=TS_WITH_ZONE)
+		if not ts.tzinfo:
+			ts = ts.replace(tzinfo=TS_WITH_ZONE.tzinfo)
+		ts = datetime_to_ns(ts)
+		self._detect(datestr, ts)
+		return ts
+
+	def _detect(self, datestr, ts):
+		for regex, build in FAST_DATE_FORMATS:
+			match = regex.match(datestr)
+			if not match:
+				continue
+			try:
+				if build(match) != ts:
+					continue
+			except ValueError:
+				continue
+			self._regex = regex
+			self._build = build
+			return
+
+def timestamp_builder(regex, filename):
+	groups = regex.groupindex
+	pattern = regex.pattern
+	if not groups:
+		date_parser = FastDateParser()
+		def build_from_string(match):
+			sortstr = match.group(1)
+			if not sortstr:
+				raise LogIntError("unmatched or empty capture group with regex '{}' in file '{}' with line: {}", pattern, filename, match.string)
+			try:
+				return date_parser.parse(sortstr)
+			except ValueError:
+				raise LogIntError("got invalid date string '{}' with regex '{}' in file '{}' with line: {}", sortstr, pattern, filename, match.string)
+		return build_from_string
+
+	if 's' in groups:
+		s_grp = groups['s']
+		def build_from_unix(match):
+			try:
+				return int(match.group(s_grp)) * 1000000000
+			except ValueError:
+				pass
+			try:
+				return int(round(float(match.group(s_grp)) * 1000000)) * 1000
+			except ValueError:
+				raise LogIntError("got invalid unix timestamp '{}' with regex '{}' in file '{}' with line: {}", match.group(s_grp), pattern, filename, match.string)
+		return build_from_unix
+
+	y_grp = groups.get('y', 0)
+	m_grp = groups.get('m', 0)
+	b_grp = groups.get('b', 0)
+	d_grp = groups['d']
+	H_grp = groups.get('H', 0)
+	M_grp = groups.get('M', 0)
+	S_grp = groups.get('S', 0)
+	f_grp = groups.get('f', 0)
+	def build_from_components(match):
+		if m_grp:
 			try:
-				return datetime.datetime(
-						year,
-						month,
-						int(vals['d']),
-						int(vals['H']) if 'H' in vals else 0,
-						int(vals['M']) if 'M' in vals else 0,
-						int(vals['S']) if 'S' in vals else 0,
-						int(vals['f'].strip().ljust(6, '0')) if 'f' in vals else 0,
-						TS_WITH_ZONE.tzinfo
-					)
-			except ValueError as e:
-				sys.exit("ERROR: got invalid date values from match '{}' with regex '{}' in file '{}': {}".format(match.group(), match.re.pattern, filename, e))
-	else:
-		sortstr = match.group(1)
-		if not sortstr:
-			sys.exit("ERROR: unmatched or empty capture group with regex '{}' in file '{}' with line: {}".format(match.re.pattern, filename, match.string))
+				month = _INT2[match.group(m_grp)]
+			except ValueError:
+				raise LogIntError("got invalid integer month '{}' with regex '{}' in file '{}' with line: {}", match.group(m_grp), pattern, filename, match.string)
+		else:
+			try:
+				month = month_from_str(match.group(b_grp))
+			except ValueError:
+				raise LogIntError("got invalid month string '{}' with regex '{}' in file '{}' with line: {}", match.group(b_grp), pattern, filename, match.string)
+		if y_grp:
+			try:
+				year = _YEARS[match.group(y_grp)]
+			except ValueError:
+				raise LogIntError("got invalid integer year '{}' with regex '{}' in file '{}' with line: {}", match.group(y_grp), pattern, filename, match.string)
+		else:
+			year = TS_WITH_ZONE.year
 		try:
-			return dateutil.parser.parse(sortstr, default=TS_WITH_ZONE)
-		except ValueError:
-			sys.exit("ERROR: got invalid date string '{}' with regex '{}' in file '{}' with line: {}".format(sortstr, match.re.pattern, filename, match.string))
-
-def get_input_line(inp_id):
-	inp = inputs[inp_id]
-	line = inp[0].readline()
-	if not line:
-		return None
-	line = line.rstrip('\n')
-	match = regexes[inp[1]].search(line)
-	if not match:
-		sys.exit("ERROR: unmatched line with regex '{}' in file '{}' with line: {}".format(regexes[inp[1]].pattern, inp[0].name, line))
-	return (datetime_from_match(match, inp[0].name), line, inp_id)
-
-_buff_print_linebuff = []
-def buff_print(line):
-	_buff_print_linebuff.append(line)
-	if len(_buff_print_linebuff) >= 256:
-		print('\n'.join(_buff_print_linebuff))
-		del _buff_print_linebuff[:]
+			return epoch_ns(
+					year,
+					month,
+					_INT2[match.group(d_grp)],
+					_INT2[match.group(H_grp)] if H_grp else 0,
+					_INT2[match.group(M_grp)] if M_grp else 0,
+					_INT2[match.group(S_grp)] if S_grp else 0,
+					int(match.group(f_grp).strip().ljust(6, b'0')) if f_grp else 0
+				)
+		except ValueError as e:
+			raise LogIntError("got invalid date values from match '{}' with regex '{}' in file '{}': {}", match.group(), pattern, filename, e)
+	return build_from_components
+
+def re2_search(regex):
+	options = re2.Options()
+	options.log_errors = False
+	try:
+		return re2.compile(regex.pattern, options).search
+	except re2.error:
+		return regex.search
+
+class PosixChunkReader(object):
+	def __init__(self, file):
+		self.file = file
+		self.name = file.name
+
+	def read(self):
+		return self.file.read(READ_CHUNK_SIZE)
+
+class MmapChunkReader(object):
+	def __init__(self, file):
+		self.file = file
+		self.name = file.name
+		self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		if hasattr(mmap, 'MADV_SEQUENTIAL'):
+			self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+		self._size = len(self._mmap)
+		self._pos = 0
+
+	def read(self):
+		pos = self._pos
+		end = pos + READ_CHUNK_SIZE
+		if end < self._size:
+			newline = self._mmap.rfind(b'\n', pos, end)
+			if newline >= 0:
+				end = newline + 1
+		else:
+			end = self._size
+		self._pos = end
+		return self._mmap[pos:end]
+
+class UringChunkReader(object):
+	def __init__(self, file):
+		self.file = file
+		self.name = file.name
+		self._fd = file.fileno()
+		self._buf = bytearray(READ_CHUNK_SIZE)
+		self._offset = 0
+		self._ring = liburing.Ring()
+		self._cqe = liburing.Cqe()
+		liburing.io_uring_queue_init(1, self._ring)
+		self._pending = False
+		self._submit()
+
+	def _submit(self):
+		sqe = liburing.io_uring_get_sqe(self._ring)
+		liburing.io_uring_prep_read(sqe, self._fd, self._buf, self._offset)
+		liburing.io_uring_submit(self._ring)
+		self._pending = True
+
+	def read(self):
+		if not self._pending:
+			return b''
+		liburing.io_uring_wait_cqe(self._ring, self._cqe)
+		cqe = self._cqe[0]
+		res = cqe.res
+		liburing.io_uring_cqe_seen(self._ring, cqe)
+		self._pending = False
+		if res <= 0:
+			liburing.io_uring_queue_exit(self._ring)
+			if res < 0:
+				raise OSError(-res, os.strerror(-res), self.name)
+			return b''
+		chunk = bytes(self._buf[:res])
+		self._offset += res
+		self._submit()
+		return chunk
+
+def open_chunk_reader(filename, io_uring=False, use_mmap=False):
+	file = open(filename, 'rb', buffering=1 << 20)
+	if io_uring:
+		return UringChunkReader(file)
+	if use_mmap:
+		try:
+			return MmapChunkReader(file)
+		except (ValueError, EnvironmentError):
+			pass
+	return PosixChunkReader(file)
+
+def read_line_chunks(reader):
+	residual = b''
+	while True:
+		chunk = reader.read()
+		if not chunk:
+			break
+		data = residual + chunk
+		held = b''
+		if b'\r' in data:
+			if data.endswith(b'\r'):
+				data, held = data[:-1], b'\r'
+			data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+		lines = data.split(b'\n')
+		residual = lines.pop() + held
+		if lines:
+			yield lines
+	if residual:
+		yield [residual.rstrip(b'\r')]
+
+PARSER_QUEUE_SIZE = 4
+PARSER_BATCH_LINES = 256
+class ParserWorker(object):
+	def __init__(self, reader, inp_id, regex, search):
+		self.reader = reader
+		self.inp_id = inp_id
+		self.regex = regex
+		self.search = search
+		self.build_ts = timestamp_builder(regex, reader.name)
+		self.q = queue.Queue(maxsize=PARSER_QUEUE_SIZE)
+		self._batch = iter(())
+		self._eof = False
+		self._thread = threading.Thread(target=self._producer)
+		self._thread.daemon = True
+
+	def start(self):
+		self._thread.start()
+
+	def _producer(self):
+		search = self.search
+		build_ts = self.build_ts
+		filename = self.reader.name
+		inp_id = self.inp_id
+		batch = []
+		try:
+			for chunk in read_line_chunks(self.reader):
+				for line in chunk:
+					match = search(line)
+					if not match:
+						raise LogIntError("unmatched line with regex '{}' in file '{}' with line: {}", self.regex.pattern, filename, line)
+					batch.append((build_ts(match), inp_id, line))
+					if len(batch) >= PARSER_BATCH_LINES:
+						self.q.put(batch)
+						batch = []
+		except (OSError, IOError) as e:
+			if batch:
+				self.q.put(batch)
+			self.q.put(LogIntError("can not read file '{}': {}", filename, e.strerror))
+			return
+		except Exception as e:
+			if batch:
+				self.q.put(batch)
+			self.q.put(e)
+			return
+		if batch:
+			self.q.put(batch)
+		self.q.put([])
+
+	def next_line(self):
+		for line in self._batch:
+			return line
+		if self._eof:
+			return None
+		batch = self.q.get()
+		if isinstance(batch, BaseException):
+			raise batch
+		if not batch:
+			self._eof = True
+			return None
+		self._batch = iter(batch)
+		return next(self._batch)
+
+OUTPUT_BUFFER_LINES = 4096
+_output_linebuff = []
+def flush_output(out_write=STDOUT.write):
+	if _output_linebuff:
+		_output_linebuff.append(b'')
+		out_write(b'\n'.join(_output_linebuff))
+		del _output_linebuff[:]
 
 parser = argparse.ArgumentParser(
-	usage="%(prog)s [-h] [file [file ...]] [-r regex [file ...]] ...",
+	usage="%(prog)s [-h] [--io-uring | --mmap] [--re2] [file [file ...]] [-r regex [file ...]] ...",
 	formatter_class=argparse.RawDescriptionHelpFormatter,
 	description=(
 		"Interleaves lines from multiple log files by timestamp\n"
@@ -146,6 +443,9 @@ parser = argparse.ArgumentParser(
 		"  Jan 01 08:01:01                 '^(?P<b>\\w+) (?P<d>[0-9]+) (?P<H>[0-9]+):(?P<M>[0-9]+):(?P<S>[0-9]+)'\n"
 		))
 parser.add_argument('-r', nargs='+', metavar=("regex", "file"), action='append', help="Specify a custom timestamp regex for all following files")
+parser.add_argument('--io-uring', action='store_true', help="Read files through io_uring (Linux only, requires the liburing module)")
+parser.add_argument('--mmap', action='store_true', help="Memory map regular files instead of reading them (only for files that aren't truncated or appended to while running)")
+parser.add_argument('--re2', action='store_true', help="Match regexes with RE2 where the pattern allows it, avoiding backtracking (requires the google-re2 package)")
 parser.add_argument('file', nargs='*')
 
 args = parser.parse_args()
@@ -157,50 +457,76 @@ if args.r:
 		if len(group) <= 1:
 			parser.print_usage(sys.stderr)
 			sys.exit(2)
+if args.io_uring and (liburing is None or not sys.platform.startswith('linux')):
+	sys.exit("ERROR: --io-uring requires Linux and the liburing module")
+if args.io_uring and args.mmap:
+	parser.print_usage(sys.stderr)
+	sys.exit(2)
+if args.re2 and (re2 is None or not hasattr(re2, 'Options')):
+	sys.exit("ERROR: --re2 requires the google-re2 package")
 
 log_files = {}
 regexes = []
 try:
 	if args.file:
-		regexes.append(re.compile(DEFAULT_REGEX))
+		regexes.append(re.compile(DEFAULT_REGEX.encode('utf-8')))
 		log_files[len(regexes)-1] = args.file
 	if args.r:
 		for group in args.r:
-			regexes.append(re.compile(group[0]))
+			regexes.append(re.compile(group[0].encode('utf-8')))
 			log_files[len(regexes)-1] = group[1:]
 except re.error as e:
-	sys.exit("Error in regex '{}' at position {}: {}".format(e.pattern, e.pos, e.msg))
+	sys.exit("Error in regex '{}' at position {}: {}".format(text(e.pattern), e.pos, e.msg))
 for regex in regexes:
 	if regex.groupindex:
 		if not VALID_COMPONENTS.issuperset(regex.groupindex):
-			sys.exit("ERROR: unrecognized named capture group '{}' in regex '{}'".format(set(regex.groupindex).difference(VALID_COMPONENTS).pop(), regex.pattern))
+			sys.exit("ERROR: unrecognized named capture group '{}' in regex '{}'".format(set(regex.groupindex).difference(VALID_COMPONENTS).pop(), text(regex.pattern)))
 		if 's' in regex.groupindex:
 			continue
 		if 'd' in regex.groupindex and {'m', 'b'}.intersection(regex.groupindex):
 			continue
-		sys.exit("ERROR: missing required named capture groups in regex '{}'".format(regex.pattern))
+		sys.exit("ERROR: missing required named capture groups in regex '{}'".format(text(regex.pattern)))
 	elif regex.groups < 1:
-		sys.exit("ERROR: missing required capture group in regex '{}'".format(regex.pattern))
+		sys.exit("ERROR: missing required capture group in regex '{}'".format(text(regex.pattern)))
+if args.re2:
+	regex_searches = [re2_search(regex) for regex in regexes]
+else:
+	regex_searches = [regex.search for regex in regexes]
 
 inputs = []
 try:
 	for regex_id, files in log_files.items():
 		for file in files:
-			inputs.append((open(file, 'r'), regex_id))
+			inputs.append(ParserWorker(open_chunk_reader(file, args.io_uring, args.mmap), len(inputs), regexes[regex_id], regex_searches[regex_id]))
 except (OSError, IOError) as e:
 	sys.exit("ERROR: can not open file '{}': {}".format(e.filename, e.strerror))
+for inp in inputs:
+	inp.start()
+next_line = [inp.next_line for inp in inputs]
 
-lines = [inp for inp in (get_input_line(inp_id) for inp_id in range(len(inputs))) if inp]
-
-lines.sort(reverse=True)
-while lines:
-	outline = lines.pop()
-	buff_print(outline[1])
-	newline = get_input_line(outline[2])
-	while newline:
-		if lines and newline[0] > lines[-1][0]:
-			lines.append(newline)
-			lines.sort(reverse=True)
-			break
-		buff_print(newline[1])
-		newline = get_input_line(newline[2])
+try:
+	lines = [line for line in (get_line() for get_line in next_line) if line]
+
+	heapq.heapify(lines)
+	outbuf_append = _output_linebuff.append
+	outline = heapq.heappop(lines) if lines else None
+	while outline:
+		outbuf_append(outline[2])
+		newline = next_line[outline[1]]()
+		while newline and (not lines or newline[0] <= lines[0][0]):
+			outbuf_append(newline[2])
+			if len(_output_linebuff) >= OUTPUT_BUFFER_LINES:
+				flush_output()
+			newline = next_line[newline[1]]()
+		if len(_output_linebuff) >= OUTPUT_BUFFER_LINES:
+			flush_output()
+		if newline:
+			outline = heapq.heapreplace(lines, newline)
+		elif lines:
+			outline = heapq.heappop(lines)
+		else:
+			outline = None
+except LogIntError as e:
+	flush_output()
+	sys.exit("ERROR: {}".format(e))
+flush_output()